@@ -0,0 +1,139 @@
+"""
+Login latency under concurrency.
+
+Fires CONCURRENT_LOGINS simultaneous /token requests while a probe keeps
+pinging a trivial async endpoint and another validates a token with a cold
+cache (the first request after every login). Reports login latency, how long
+the event loop stalled (probe lag) and cache-miss get_current_user latency
+during the burst. Runs two variants of the login handler:
+  - inline: bcrypt.checkpw on the event loop (the old /token behaviour)
+  - pooled: core.auth.authenticate_user (bcrypt in the auth thread pool)
+Then measures get_current_user with and without the validated-token cache.
+
+Usage (from backend/):  python -m benchmarks.auth_benchmark
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+# Isolated user DB so the benchmark never touches the real one
+os.environ.setdefault("SCFCE_USER_DB", os.path.join(tempfile.mkdtemp(), "bench_users.db"))
+
+import httpx
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+
+from core import auth
+
+CONCURRENT_LOGINS = 32
+PROBE_INTERVAL_S = 0.005
+TOKEN_CHECKS = 2000
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.post("/token_inline")
+    async def login_inline(form_data: OAuth2PasswordRequestForm = Depends()):
+        user = auth.user_store.get_user(form_data.username)
+        if not user or not auth.verify_password(form_data.password, user['hashed_password']):
+            raise HTTPException(status_code=401)
+        return {"access_token": auth.create_access_token({"sub": user['username']}), "token_type": "bearer"}
+
+    @app.post("/token")
+    async def login_pooled(form_data: OAuth2PasswordRequestForm = Depends()):
+        user = await auth.authenticate_user(form_data.username, form_data.password)
+        if not user:
+            raise HTTPException(status_code=401)
+        return {"access_token": auth.create_access_token({"sub": user['username']}), "token_type": "bearer"}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run_variant(client, path):
+    stop = asyncio.Event()
+    probe_lags = []
+    miss_latencies = []
+    token = auth.create_access_token({"sub": "admin"})
+
+    async def probe():
+        # Lag = how late a short sleep + trivial request completes; a blocked
+        # event loop shows up here as the length of the block
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL_S)
+            await client.get("/ping")
+            probe_lags.append(time.perf_counter() - start - PROBE_INTERVAL_S)
+
+    async def token_check():
+        # Cache-miss validation: JWT decode + user-store lookup
+        while not stop.is_set():
+            auth.token_cache._entries.clear()
+            start = time.perf_counter()
+            await auth.get_current_user(token)
+            miss_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(PROBE_INTERVAL_S)
+
+    async def login():
+        start = time.perf_counter()
+        response = await client.post(path, data={"username": "admin", "password": "admin123"})
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    check_task = asyncio.create_task(token_check())
+    login_latencies = await asyncio.gather(*(login() for _ in range(CONCURRENT_LOGINS)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(probe_task, check_task)
+
+    print(f"  {path:<14} logins={CONCURRENT_LOGINS} wall={wall * 1000:8.1f}ms "
+          f"login p50={percentile(login_latencies, 50) * 1000:7.1f}ms p95={percentile(login_latencies, 95) * 1000:7.1f}ms "
+          f"| loop lag p50={percentile(probe_lags, 50) * 1000:6.1f}ms "
+          f"max={max(probe_lags) * 1000:7.1f}ms "
+          f"| cache-miss auth p50={percentile(miss_latencies, 50) * 1000:6.1f}ms "
+          f"max={max(miss_latencies) * 1000:7.1f}ms")
+
+
+async def bench_token_validation():
+    token = auth.create_access_token({"sub": "admin"})
+
+    auth.token_cache._entries.clear()
+    start = time.perf_counter()
+    for _ in range(TOKEN_CHECKS):
+        auth.token_cache._entries.clear()
+        await auth.get_current_user(token)
+    uncached = (time.perf_counter() - start) / TOKEN_CHECKS
+
+    start = time.perf_counter()
+    for _ in range(TOKEN_CHECKS):
+        await auth.get_current_user(token)
+    cached = (time.perf_counter() - start) / TOKEN_CHECKS
+
+    print(f"  get_current_user: uncached={uncached * 1e6:8.1f}us  cached={cached * 1e6:8.1f}us")
+
+
+async def main():
+    print(f"Auth benchmark (bcrypt pool workers={auth.AUTH_POOL_WORKERS}, "
+          f"lookup workers={auth.USER_LOOKUP_WORKERS})")
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_variant(client, "/token_inline")
+        await run_variant(client, "/token")
+    await bench_token_validation()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,17 +1,42 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import bcrypt  # We use this directly now
+from .user_store import create_user_store
 
 # CONFIG
 SECRET_KEY = "senior_engineer_secret_key_change_in_prod"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+AUTH_POOL_WORKERS = 4          # Max concurrent bcrypt hashes/checks per worker
+USER_LOOKUP_WORKERS = 4        # User-store lookups (kept off the bcrypt pool)
+TOKEN_CACHE_TTL_SECONDS = 60   # How long validated token claims are trusted
+TOKEN_CACHE_MAX_ENTRIES = 10000
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# bcrypt is deliberately slow (~100ms+); running it on the event loop stalls
+# every request and WebSocket on the worker, so it goes to a bounded pool.
+auth_executor = ThreadPoolExecutor(max_workers=AUTH_POOL_WORKERS, thread_name_prefix="auth")
+# User lookups are sub-millisecond point reads; a separate pool keeps token
+# validation from queueing behind a burst of logins.
+lookup_executor = ThreadPoolExecutor(max_workers=USER_LOOKUP_WORKERS, thread_name_prefix="user-lookup")
+
+async def run_in_auth_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(auth_executor, func, *args)
+
+async def lookup_user(username):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(lookup_executor, user_store.get_user, username)
+
 # Helper functions to handle hashing directly
 def verify_password(plain_password, hashed_password):
     # Ensure bytes for bcrypt
@@ -19,7 +44,7 @@ def verify_password(plain_password, hashed_password):
         plain_password = plain_password.encode('utf-8')
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode('utf-8')
-    
+
     return bcrypt.checkpw(plain_password, hashed_password)
 
 def get_password_hash(password):
@@ -28,15 +53,22 @@ def get_password_hash(password):
     # hashpw returns bytes, we decode to str for storage
     return bcrypt.hashpw(password, bcrypt.gensalt()).decode('utf-8')
 
-# Mock User DB
-fake_users_db = {
-    "admin": {
-        "username": "admin",
-        # We pre-hash "admin123" here so the DB is ready on startup
-        "hashed_password": get_password_hash("admin123"), 
-        "role": "admin"
-    }
-}
+async def verify_password_async(plain_password, hashed_password):
+    return await run_in_auth_pool(verify_password, plain_password, hashed_password)
+
+# User Store (pluggable via SCFCE_USER_STORE; local SQLite by default)
+user_store = create_user_store()
+
+# Seed the default admin once (hashing "admin123" only if the DB has no admin yet)
+if user_store.get_user("admin") is None:
+    user_store.add_user("admin", get_password_hash("admin123"), role="admin")
+
+async def authenticate_user(username, password):
+    """Returns the user dict, or None if the username/password is wrong."""
+    user = await lookup_user(username)
+    if not user or not await verify_password_async(password, user['hashed_password']):
+        return None
+    return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -48,7 +80,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class TokenCache:
+    """Short-TTL, size-bounded cache of validated tokens -> user."""
+    def __init__(self, ttl=TOKEN_CACHE_TTL_SECONDS, max_entries=TOKEN_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token, user, token_exp):
+        # Never trust a cached token beyond its own JWT expiry
+        remaining = token_exp - time.time() if token_exp else self.ttl
+        expires_at = time.monotonic() + min(self.ttl, remaining)
+        with self._lock:
+            self._entries[token] = (expires_at, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+token_cache = TokenCache()
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -61,7 +129,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = fake_users_db.get(username)
+    user = await lookup_user(username)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    token_cache.put(token, user, payload.get("exp"))
+    return user
@@ -0,0 +1,144 @@
+import heapq
+import math
+import random
+import numpy as np
+from .simulator import SimulationEngine
+
+
+class EventDrivenSimulationEngine(SimulationEngine):
+    """
+    Frontier-only alternative to SimulationEngine.
+
+    When a node activates, every susceptible neighbor gets ONE scheduled
+    "first successful transmission" event instead of a fresh coin flip each
+    step: a geometric delay in discrete time, or an exponential delay in
+    continuous time (same per-step success probability). Events live in a
+    priority queue, so each tick only touches the nodes activated in it and
+    their neighborhoods, and the run stops as soon as the queue is empty.
+    """
+    def __init__(self, config):
+        super().__init__(config)
+
+        index = self.graph.influence
+        self.nodes = index.nodes
+        self.adjacency = index.adjacency
+        self.state = np.zeros(index.num_nodes, dtype=bool)
+
+        # Event queue entries: (time, sequence, source_idx, target_idx)
+        self.events = []
+        self._sequence = 0
+
+    def _schedule(self, sources, times):
+        """Schedules transmission events from newly activated `sources`."""
+        A = self.adjacency
+        pairs_src, pairs_dst = [], []
+        for src in sources:
+            neighbors = A.indices[A.indptr[src]:A.indptr[src + 1]]
+            neighbors = neighbors[~self.state[neighbors]]
+            pairs_src.append(np.full(len(neighbors), src))
+            pairs_dst.append(neighbors)
+        if not pairs_dst:
+            return
+        pairs_src = np.concatenate(pairs_src)
+        pairs_dst = np.concatenate(pairs_dst)
+        if len(pairs_dst) == 0:
+            return
+
+        # --- AI STEP: LOCAL GNN PREDICTION (frontier neighborhoods only) ---
+        targets, inverse = np.unique(pairs_dst, return_inverse=True)
+        gnn_probs = self.gnn.predict_local(self.graph, self.state, self.calculated_risk, targets)[inverse]
+
+        # Combine the GNN's structural prediction with the Text Risk
+        final_prob = (gnn_probs * 0.8) + (self.calculated_risk * 0.2)
+        if self.ga_params:
+            final_prob /= self.ga_params['optimized_suppression']
+        final_prob = np.clip(final_prob, 0.0, 1.0)
+
+        for src, dst, p in zip(pairs_src, pairs_dst, final_prob):
+            if p <= 0.0:
+                continue
+            delay = self._sample_delay(p)
+            self._sequence += 1
+            heapq.heappush(self.events, (times[src] + delay, self._sequence, int(src), int(dst)))
+
+    def _sample_delay(self, p):
+        """Time until the first successful per-step attempt with probability p."""
+        if p >= 1.0:
+            return 1.0 if not self.config.continuous_time else 0.0
+        u = 1.0 - random.random()  # (0, 1]
+        if self.config.continuous_time:
+            # Exponential with rate -ln(1 - p): P(delay <= 1) = p
+            return math.log(u) / math.log(1.0 - p)
+        # Geometric: number of steps until the first success (>= 1)
+        return float(max(1, math.ceil(math.log(u) / math.log(1.0 - p))))
+
+    def step(self, timestep):
+        new_activations = []
+        new_paths = []
+        tick_end = timestep + 1
+
+        # Process events in waves: nodes activated in this tick may (in
+        # continuous time) schedule further events that still land in it
+        while self.events and self.events[0][0] <= tick_end:
+            activated = {}
+            while self.events and self.events[0][0] <= tick_end:
+                time, _, src, dst = heapq.heappop(self.events)
+                if self.state[dst] or dst in activated:
+                    continue  # Stale event: target already infected
+                activated[dst] = time
+
+                src_name = self.get_display_name(self.nodes[src])
+                tgt_name = self.get_display_name(self.nodes[dst])
+                new_activations.append(dst)
+                new_paths.append([src_name, tgt_name])
+                self.transmission_counts[src_name] = self.transmission_counts.get(src_name, 0) + 1
+
+            for dst in activated:
+                self.state[dst] = True
+                self.graph.G.nodes[self.nodes[dst]]['state'] = 1
+            self._schedule(list(activated), activated)
+
+        if self.state.all():
+            self.events.clear()  # Saturated: every remaining event is stale
+
+        return self._step_data(timestep, new_activations, new_paths)
+
+    def _step_data(self, timestep, new_activations, new_paths):
+        sorted_influencers = sorted(
+            self.transmission_counts.items(),
+            key=lambda item: item[1],
+            reverse=True
+        )[:5]
+        reach = int(self.state.sum())
+
+        return {
+            "timestep": timestep,
+            "active_spreaders": reach,
+            "total_reach": reach,
+            "newly_activated": [self.get_display_name(self.nodes[n]) for n in new_activations],
+            "activation_paths": new_paths,
+            "live_top_5": [{"id": k, "count": v} for k, v in sorted_influencers]
+        }
+
+    def run(self):
+        # Initialize seed nodes (activated at time 0)
+        num_nodes = len(self.nodes)
+        num_seeds = min(self.config.seed_nodes, num_nodes)
+
+        if num_seeds > 0:
+            seeds = random.sample(range(num_nodes), num_seeds)
+            for s in seeds:
+                self.state[s] = True
+                self.graph.G.nodes[self.nodes[s]]['state'] = 1
+            self._schedule(seeds, {s: 0.0 for s in seeds})
+
+        history = []
+        for t in range(self.config.simulation_steps):
+            if not self.events:
+                # Frontier is empty: the cascade died out or saturated.
+                # Pad the remaining steps so the response keeps its length.
+                history.append(self._step_data(t, [], []))
+                continue
+            history.append(self.step(t))
+
+        return history
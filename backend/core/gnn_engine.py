@@ -11,7 +11,15 @@ class SimpleGCNLayer(nn.Module):
     def forward(self, A, X):
         # A = Adjacency (Connections), X = Features
         support = self.linear(X)
-        output = torch.matmul(A, support)
+        if A.is_sparse and support.dim() == 3:
+            # Batched features (C, N, F): one sparse product over (N, C * F)
+            C, N, F = support.shape
+            output = torch.sparse.mm(A, support.permute(1, 0, 2).reshape(N, C * F))
+            output = output.reshape(N, C, F).permute(1, 0, 2)
+        elif A.is_sparse:
+            output = torch.sparse.mm(A, support)
+        else:
+            output = torch.matmul(A, support)
         return output
 
 class GNNModel(nn.Module):
@@ -30,55 +38,57 @@ class GNNModel(nn.Module):
 class GNNEngine:
     def __init__(self, num_nodes):
         self.num_nodes = num_nodes
-        # 3 Input Features: [Is_Infected, Trust_Score, Content_Risk]
-        self.model = GNNModel(input_dim=3, hidden_dim=16)
+        # 7 Input Features: [Is_Infected, Trust_Score, Content_Risk]
+        # + influence index [Degree, PageRank, K-Core, Betweenness]
+        self.model = GNNModel(input_dim=7, hidden_dim=16)
         self.model.eval()
 
+    def _sparse_adjacency(self, graph_obj):
+        """
+        A + I as a torch sparse tensor, built once per graph from the (shared)
+        CSR adjacency of the influence index, never as a dense N x N matrix.
+        """
+        if getattr(self, '_adjacency_graph', None) is not graph_obj:
+            A = graph_obj.influence.adjacency.tocoo()
+            loops = np.arange(A.shape[0])
+            rows = np.concatenate([A.row, loops])
+            cols = np.concatenate([A.col, loops])
+            self._adjacency_graph = graph_obj
+            self._adjacency = torch.sparse_coo_tensor(
+                torch.from_numpy(np.vstack([rows, cols]).astype(np.int64)),
+                torch.ones(len(rows)),
+                A.shape,
+                check_invariants=False,
+            ).coalesce()
+        return self._adjacency
+
     def predict_new_infections(self, graph_obj, content_risk):
         """
         Runs GNN to predict infection probability.
         Returns a DICTIONARY: { 'Node_ID': probability }
         """
         G = graph_obj.G
-        
-        # 1. Create a Mapping (String ID -> Integer Index)
-        # This solves the KeyError by converting "Titan-0" to index 0, etc.
-        nodes_list = list(G.nodes())
-        node_to_idx = {node_id: i for i, node_id in enumerate(nodes_list)}
-        
+        index = graph_obj.influence
+
+        # 1. Node order = the influence index order (adjacency rows, features)
+        nodes_list = index.nodes
         num_current_nodes = len(nodes_list)
         if num_current_nodes == 0:
             return {}
 
-        # 2. Build Adjacency Matrix (A)
-        # We use the mapping to place connections in the correct matrix slots
-        A = np.eye(num_current_nodes) # Start with identity (self-loops)
-        
-        for u, v in G.edges():
-            if u in node_to_idx and v in node_to_idx:
-                i, j = node_to_idx[u], node_to_idx[v]
-                A[i, j] = 1.0
-                A[j, i] = 1.0
-                
-        A_tensor = torch.FloatTensor(A)
+        # 2. Sparse Adjacency Matrix (A) with self-loops
+        A_tensor = self._sparse_adjacency(graph_obj)
 
         # 3. Build Feature Matrix (X)
-        # We iterate over the LIST of nodes to ensure order matches the mapping
-        features = []
-        for node_id in nodes_list:
-            node_data = G.nodes[node_id]
-            
-            # Safe access to attributes with defaults
-            state = float(node_data.get('state', 0))
-            trust = float(node_data.get('trust', 0.5))
-            
-            features.append([state, trust, content_risk])
-        
-        X_tensor = torch.FloatTensor(features)
+        X = np.empty((num_current_nodes, 7), dtype=np.float32)
+        X[:, 0] = [float(G.nodes[node_id].get('state', 0)) for node_id in nodes_list]
+        X[:, 1] = index.trust
+        X[:, 2] = content_risk
+        X[:, 3:] = index.features
 
         # 4. Run GNN Forward Pass
         with torch.no_grad():
-            probs_tensor = self.model(A_tensor, X_tensor)
+            probs_tensor = self.model(A_tensor, torch.from_numpy(X))
         
         probs_flat = probs_tensor.flatten().numpy()
         
@@ -86,4 +96,69 @@ class GNNEngine:
         # Return Dict: { "User-1": 0.85, "Titan-0": 0.12, ... }
         result_map = {node_id: float(probs_flat[i]) for i, node_id in enumerate(nodes_list)}
         
-        return result_map
\ No newline at end of file
+        return result_map
+
+    def predict_new_infections_batch(self, graph_obj, states, content_risks):
+        """
+        Runs the GNN for several contents at once over the shared graph.
+        `states` is (num_nodes, num_contents), `content_risks` is (num_contents,),
+        both aligned with graph_obj.influence.nodes.
+        Returns a (num_nodes, num_contents) numpy array of probabilities.
+        """
+        index = graph_obj.influence
+        num_current_nodes = index.num_nodes
+        num_contents = len(content_risks)
+        if num_current_nodes == 0:
+            return np.zeros((0, num_contents), dtype=np.float32)
+
+        # Batched Feature Tensor (X): (num_contents, num_nodes, 7)
+        X = np.empty((num_contents, num_current_nodes, 7), dtype=np.float32)
+        X[:, :, 0] = np.asarray(states, dtype=np.float32).T
+        X[:, :, 1] = index.trust
+        X[:, :, 2] = np.asarray(content_risks, dtype=np.float32)[:, None]
+        X[:, :, 3:] = index.features
+
+        # One forward pass; the sparse A is applied to every content at once
+        with torch.no_grad():
+            probs_tensor = self.model(self._sparse_adjacency(graph_obj), torch.from_numpy(X))
+
+        return probs_tensor.squeeze(-1).numpy().T
+
+    def predict_local(self, graph_obj, states, content_risk, targets):
+        """
+        Infection probabilities for `targets` only (indices into influence.nodes).
+        The 2-layer GCN output of a node depends only on its 2-hop neighborhood,
+        so the forward pass runs on that sparse subgraph instead of the full graph.
+        `content_risk` is a scalar or a per-node array aligned with influence.nodes.
+        Returns a numpy array aligned with `targets`.
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        if len(targets) == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        A = graph_obj.influence.adjacency
+        hop1 = np.union1d(targets, A[targets].indices)
+        ball = np.union1d(hop1, A[hop1].indices)
+
+        # Sparse sub-adjacency with self-loops, in COO form for torch
+        sub = A[ball][:, ball].tocoo()
+        loops = np.arange(len(ball))
+        rows = np.concatenate([sub.row, loops])
+        cols = np.concatenate([sub.col, loops])
+        A_tensor = torch.sparse_coo_tensor(
+            torch.from_numpy(np.vstack([rows, cols]).astype(np.int64)),
+            torch.ones(len(rows)),
+            (len(ball), len(ball)),
+            check_invariants=False,
+        )
+
+        X = np.empty((len(ball), 7), dtype=np.float32)
+        X[:, 0] = np.asarray(states, dtype=np.float32)[ball]
+        X[:, 1] = graph_obj.influence.trust[ball]
+        X[:, 2] = content_risk if np.isscalar(content_risk) else np.asarray(content_risk)[ball]
+        X[:, 3:] = graph_obj.influence.features[ball]
+
+        with torch.no_grad():
+            probs_tensor = self.model(A_tensor, torch.from_numpy(X))
+
+        return probs_tensor.flatten().numpy()[np.searchsorted(ball, targets)]
@@ -5,6 +5,7 @@ from torch_geometric.nn import GCNConv
 from torch_geometric.utils import from_networkx
 import numpy as np
 import random
+from .influence_engine import InfluenceIndex
 
 # --- 1. KEEP YOUR EXISTING GCN MODEL ---
 class GCN(torch.nn.Module):
@@ -23,9 +24,14 @@ class GCN(torch.nn.Module):
 
 # --- 2. UPDATE SOCIAL GRAPH TO HANDLE UPLOADS ---
 class SocialGraph:
-    def __init__(self, num_nodes=200, custom_data=None, blocked_ids=[]):
+    def __init__(self, num_nodes=200, custom_data=None, blocked_ids=[], seed=None):
         self.G = nx.Graph()
         self.blocked_ids = set(blocked_ids) # Faster lookup
+        self.seed = seed
+
+        # Deterministic graphs (uploads, seeded random graphs) can be reused by
+        # other requests/workers, so their read-only arrays go to shared memory
+        self.shared = custom_data is not None or seed is not None
 
         # A. Build the Graph (Custom or Random)
         if custom_data:
@@ -33,7 +39,7 @@ class SocialGraph:
         else:
             self._generate_random_graph(num_nodes)
 
-        # B. Calculate Influence & Assign Categories (Titan, Mega, etc.)
+        # B. Calculate Influence & Assign Categories (Titan, Macro, Nano)
         # We do this for BOTH custom and random graphs so the GNN has features.
         self._calculate_node_features()
 
@@ -60,39 +66,32 @@ class SocialGraph:
 
     def _generate_random_graph(self, num_nodes):
         """Generates scale-free graph (Your original logic + blocking)."""
-        temp_G = nx.barabasi_albert_graph(num_nodes, 2)
+        temp_G = nx.barabasi_albert_graph(num_nodes, 2, seed=self.seed)
+        rng = np.random.default_rng(self.seed)
         
         # Transfer nodes/edges to self.G, skipping blocked ones
         # We assume IDs are integers 0..N for random graphs
         for i in range(num_nodes):
             # Check if this ID is blocked (convert to string if needed)
             if str(i) not in self.blocked_ids and f"User-{i}" not in self.blocked_ids:
-                self.G.add_node(i, trust=np.random.uniform(0.1, 0.9), state=0)
+                self.G.add_node(i, trust=rng.uniform(0.1, 0.9), state=0)
         
         for u, v in temp_G.edges():
             if self.G.has_node(u) and self.G.has_node(v):
                 self.G.add_edge(u, v)
 
     def _calculate_node_features(self):
-        """Calculates Influence tiers (Titan, Mega...) for GNN features."""
+        """Calculates Influence tiers (Titan, Macro, Nano) for GNN features."""
+        # Precomputed once per graph (PageRank, k-core, betweenness...) and
+        # reused by the simulator for naming and by the GNN for features.
+        self.influence = InfluenceIndex.from_graph(self.G, shared=self.shared)
         if self.G.number_of_nodes() == 0: return
 
-        degrees = dict(self.G.degree())
-        max_degree = max(degrees.values()) if degrees else 1
-        
-        for i in self.G.nodes():
-            deg = degrees.get(i, 0)
-            norm_inf = deg / max_degree 
-            
-            # 5-Class System (Your original logic)
-            if norm_inf > 0.8:   cat, name = "Titan", f"Titan-{i}"
-            elif norm_inf > 0.6: cat, name = "Mega", f"Mega-{i}"
-            elif norm_inf > 0.4: cat, name = "Macro", f"Macro-{i}"
-            elif norm_inf > 0.2: cat, name = "Micro", f"Micro-{i}"
-            else:                cat, name = "Nano", f"User-{i}"
+        for idx, i in enumerate(self.influence.nodes):
+            cat, name = self.influence.tier(idx)
 
             # Set Attributes required for GNN
-            self.G.nodes[i]['influence'] = norm_inf
+            self.G.nodes[i]['influence'] = float(self.influence.score[idx])
             self.G.nodes[i]['influence_cat'] = cat 
             self.G.nodes[i]['name'] = name # This name is sent to frontend
             
@@ -0,0 +1,270 @@
+import numpy as np
+import scipy.sparse as sp
+from . import shared_graph
+
+# --- INFLUENCE TIERS (Titan, Macro, Nano) ---
+# Rank-based cuts on the composite score, the same ones the frontend
+# (NetworkViz.jsx) uses, so most nodes stay "User-<id>":
+# (share of nodes, rounded up, category, name prefix)
+INFLUENCE_TIERS = [
+    (0.02, "Titan", "Titan"),
+    (0.10, "Macro", "Macro"),
+]
+DEFAULT_TIER = ("Nano", "User")
+
+# Composite score weights. The k-core number is nearly flat on scale-free
+# graphs (every node of a BA m=2 graph has core 2), so it only breaks ties.
+SCORE_WEIGHTS = {"degree": 0.3, "pagerank": 0.4, "core": 0.1, "betweenness": 0.2}
+
+# Approximate betweenness only follows shortest paths up to this many hops
+MAX_BFS_DEPTH = 64
+
+
+class InfluenceIndex:
+    """
+    Precomputed per-graph influence measures, built once with vectorized
+    sparse operations instead of networkx's pure-Python centrality routines.
+
+    All arrays are aligned with `nodes` (the graph's node iteration order):
+      - degree:       number of neighbours
+      - pagerank:     PageRank via sparse power iteration
+      - core:         k-core number via batched peeling
+      - betweenness:  betweenness estimated from sampled BFS sources
+      - trust:        per-node trust (copied from the graph attributes)
+
+    The arrays are read-only once built, so they can be published to shared
+    memory and attached zero-copy by other worker processes (see shared_graph).
+    """
+    FEATURE_NAMES = ("degree", "pagerank", "core", "betweenness")
+    SHARED_ARRAYS = ("indptr", "indices", "data", "trust", "degree", "pagerank",
+                     "core", "betweenness", "features", "score")
+
+    def __init__(self, nodes, adjacency, trust=None, betweenness_samples=32, seed=None):
+        self.nodes = list(nodes)
+        self.node_to_idx = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self.adjacency = adjacency.tocsr()
+        self.num_nodes = len(self.nodes)
+        self.trust = (np.full(self.num_nodes, 0.5, dtype=np.float32) if trust is None
+                      else np.asarray(trust, dtype=np.float32))
+
+        self.degree = np.diff(self.adjacency.indptr).astype(np.int64)
+        self.pagerank = _pagerank(self.adjacency, self.degree)
+        self.core = _core_numbers(self.adjacency, self.degree)
+        self.betweenness = _approximate_betweenness(
+            self.adjacency, betweenness_samples, np.random.default_rng(seed)
+        )
+
+        # Normalized [0, 1] feature matrix (num_nodes x 4) for the GNNs
+        self.features = np.column_stack([
+            _normalize(self.degree),
+            _normalize(self.pagerank),
+            _normalize(self.core),
+            _normalize(self.betweenness),
+        ]).astype(np.float32)
+
+        # Composite score: weighted blend of the normalized measures
+        weights = np.array([SCORE_WEIGHTS[name] for name in self.FEATURE_NAMES])
+        self.score = self.features @ weights if self.num_nodes else np.zeros(0)
+        self._assign_tiers()
+
+    @classmethod
+    def from_graph(cls, G, shared=False, **kwargs):
+        """
+        Builds the index from a NetworkX graph (self-loops are ignored).
+        With shared=True the arrays are looked up / published in shared memory,
+        so every worker holding the same graph maps a single copy.
+        """
+        nodes = list(G.nodes())
+        node_to_idx = {node_id: i for i, node_id in enumerate(nodes)}
+        n = len(nodes)
+
+        edges = np.fromiter(
+            (idx for u, v in G.edges() if u != v for idx in (node_to_idx[u], node_to_idx[v])),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        trust = np.array([float(G.nodes[i].get('trust', 0.5)) for i in nodes], dtype=np.float32)
+
+        if shared:
+            key = shared_graph.graph_fingerprint(nodes, edges, trust, kwargs)
+            arrays = shared_graph.attach(key)
+            if arrays and all(name in arrays for name in cls.SHARED_ARRAYS):
+                return cls._from_arrays(nodes, arrays)
+
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+        adjacency = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=(n, n)
+        )
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1.0
+
+        index = cls(nodes, adjacency, trust=trust, **kwargs)
+        if shared:
+            arrays = shared_graph.publish(key, index.to_arrays())
+            if all(name in arrays for name in cls.SHARED_ARRAYS):
+                index = cls._from_arrays(nodes, arrays)  # Drop the private copy
+        return index
+
+    @classmethod
+    def _from_arrays(cls, nodes, arrays):
+        """Wraps precomputed (possibly mmap'd, read-only) arrays without copying."""
+        index = cls.__new__(cls)
+        index.nodes = list(nodes)
+        index.node_to_idx = {node_id: i for i, node_id in enumerate(index.nodes)}
+        index.num_nodes = len(index.nodes)
+        index.adjacency = sp.csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]),
+            shape=(index.num_nodes, index.num_nodes), copy=False,
+        )
+        for name in ("trust", "degree", "pagerank", "core", "betweenness", "features", "score"):
+            setattr(index, name, arrays[name])
+        index._assign_tiers()
+        return index
+
+    def to_arrays(self):
+        return {
+            "indptr": self.adjacency.indptr,
+            "indices": self.adjacency.indices,
+            "data": self.adjacency.data,
+            "trust": self.trust,
+            "degree": self.degree,
+            "pagerank": self.pagerank,
+            "core": self.core,
+            "betweenness": self.betweenness,
+            "features": self.features,
+            "score": self.score,
+        }
+
+    def _assign_tiers(self):
+        """Tier per node (index into INFLUENCE_TIERS, len = default) by score rank."""
+        n = self.num_nodes
+        self.tier_codes = np.full(n, len(INFLUENCE_TIERS), dtype=np.int64)
+        ranked = np.argsort(-np.asarray(self.score), kind="stable")
+        start = 0
+        for code, (share, _, _) in enumerate(INFLUENCE_TIERS):
+            stop = min(n, start + int(np.ceil(n * share)))
+            self.tier_codes[ranked[start:stop]] = code
+            start = stop
+
+    def tier(self, idx):
+        """Returns (category, name) for the node at index `idx`."""
+        node_id = self.nodes[idx]
+        code = self.tier_codes[idx]
+        cat, prefix = INFLUENCE_TIERS[code][1:] if code < len(INFLUENCE_TIERS) else DEFAULT_TIER
+        return cat, f"{prefix}-{node_id}"
+
+
+# --- VECTORIZED KERNELS ---
+def _normalize(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return values
+    peak = values.max()
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def _pagerank(A, degree, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """Power iteration on the (symmetric) adjacency; same stopping rule as networkx."""
+    n = A.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+    dangling = degree == 0
+    x = np.full(n, 1.0 / n)
+
+    for _ in range(max_iter):
+        prev = x
+        # Dangling nodes (isolated users) redistribute their rank uniformly
+        x = alpha * (A @ (prev * inv_degree)) + (alpha * prev[dangling].sum() + 1.0 - alpha) / n
+        if np.abs(x - prev).sum() < n * tol:
+            break
+    return x
+
+
+def _core_numbers(A, degree):
+    """
+    Batagelj-Zaversnik peeling, one sparse mat-vec per round: every node whose
+    remaining degree is <= k is removed at once and gets core number k.
+    """
+    n = A.shape[0]
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    remaining = degree.astype(np.int64).copy()
+    k = 0
+
+    while alive.any():
+        k = max(k, int(remaining[alive].min()))
+        while True:
+            peel = alive & (remaining <= k)
+            if not peel.any():
+                break
+            core[peel] = k
+            alive[peel] = False
+            remaining -= np.rint(A @ peel.astype(np.float64)).astype(np.int64)
+    return core
+
+
+def _approximate_betweenness(A, num_samples, rng, batch_size=16, max_depth=MAX_BFS_DEPTH):
+    """
+    Brandes' algorithm from `num_samples` random sources, run level-synchronously
+    on a block of sources at a time. Scaled like
+    networkx.betweenness_centrality(k=num_samples, normalized=True).
+
+    BFS stops after `max_depth` levels, so long chains (e.g. an uploaded path
+    graph) cannot stall a request; on small-world graphs this never triggers.
+    """
+    n = A.shape[0]
+    betweenness = np.zeros(n)
+    if n < 3 or num_samples <= 0:
+        return betweenness
+
+    k = min(num_samples, n)
+    sources = np.arange(n) if k == n else rng.choice(n, size=k, replace=False)
+
+    for start in range(0, k, batch_size):
+        betweenness += _brandes_batch(A, sources[start:start + batch_size], max_depth)
+
+    return betweenness * (n / k) / ((n - 1) * (n - 2))
+
+
+def _brandes_batch(A, sources, max_depth):
+    """
+    Each level only touches its own (node, source) entries: the frontier is a
+    sparse (n x b) matrix, so the work per level is proportional to the edges
+    leaving that level rather than to n * b.
+    """
+    n, b = A.shape[0], len(sources)
+    cols = np.arange(b)
+
+    # Forward: BFS levels and shortest-path counts (sigma), one column per source
+    dist = np.full((n, b), -1, dtype=np.int32)
+    sigma = np.zeros((n, b))
+    dist[sources, cols] = 0
+    sigma[sources, cols] = 1.0
+
+    levels = [(np.asarray(sources), cols)]
+    while len(levels) <= max_depth:
+        rows, level_cols = levels[-1]
+        frontier = sp.csr_matrix((sigma[rows, level_cols], (rows, level_cols)), shape=(n, b))
+        reach = (A @ frontier).tocoo()
+        new = dist[reach.row, reach.col] < 0
+        if not new.any():
+            break
+        rows, level_cols = reach.row[new], reach.col[new]
+        dist[rows, level_cols] = len(levels)
+        sigma[rows, level_cols] = reach.data[new]
+        levels.append((rows, level_cols))
+
+    # Backward: accumulate dependencies from the deepest level up
+    delta = np.zeros((n, b))
+    for d in range(len(levels) - 1, 0, -1):
+        rows, level_cols = levels[d]
+        coef = (1.0 + delta[rows, level_cols]) / sigma[rows, level_cols]
+        spread = (A @ sp.csr_matrix((coef, (rows, level_cols)), shape=(n, b))).tocoo()
+        parents = dist[spread.row, spread.col] == d - 1
+        prow, pcol = spread.row[parents], spread.col[parents]
+        delta[prow, pcol] += sigma[prow, pcol] * spread.data[parents]
+
+    delta[sources, cols] = 0.0
+    return delta.sum(axis=1)
@@ -0,0 +1,357 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+import numpy as np
+from .graph_engine import SocialGraph
+from .gnn_engine import GNNEngine
+
+# CONFIG
+LIVE_NUM_NODES = int(os.environ.get("SCFCE_LIVE_NUM_NODES", "250"))
+LIVE_GRAPH_SEED = int(os.environ.get("SCFCE_LIVE_GRAPH_SEED", "0"))
+LIVE_INGEST_FILE = os.environ.get("SCFCE_INGEST_FILE")  # Optional JSONL file to tail
+WINDOW_SECONDS = float(os.environ.get("SCFCE_LIVE_WINDOW_SECONDS", "300"))
+MAX_WINDOW_EVENTS = 1_000_000   # Hard cap on events held in the window
+MAX_PENDING_EVENTS = 200_000    # Feed backlog; oldest events are dropped beyond this
+INGEST_BATCH_SIZE = 20_000      # Events applied per drain
+REFRESH_INTERVAL_SECONDS = 0.5  # GNN refresh + hot-spot push cadence
+HOT_SPOTS = 10
+# Held by the one process that owns the live tracker (see LiveIngestService.start)
+INGEST_LOCK_PATH = os.environ.get("SCFCE_INGEST_LOCK", os.path.join(tempfile.gettempdir(), "scfce_live_ingest.lock"))
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-worker is not enforced
+    fcntl = None
+
+
+class EventWindow:
+    """
+    Fixed-capacity ring buffer of ingested share events, ordered by ingest
+    time. Memory is bounded by `capacity` regardless of the event rate.
+    """
+    def __init__(self, capacity=MAX_WINDOW_EVENTS):
+        self.capacity = capacity
+        self.ingested_at = np.zeros(capacity)
+        self.node = np.zeros(capacity, dtype=np.int64)
+        self.risk = np.zeros(capacity, dtype=np.float32)
+        self.content = np.empty(capacity, dtype=object)
+        self.head = 0   # Oldest event
+        self.size = 0
+
+    def _positions(self, start, count):
+        return (self.head + start + np.arange(count)) % self.capacity
+
+    def append(self, now, nodes, risks, contents):
+        """
+        Adds a batch of at most `capacity` events (callers trim larger ones);
+        returns the events evicted early to make room.
+        """
+        count = len(nodes)
+        if count > self.capacity:
+            raise ValueError(f"Batch of {count} events exceeds window capacity {self.capacity}")
+        evicted = self.pop_oldest(max(0, self.size + count - self.capacity))
+
+        pos = self._positions(self.size, count)
+        self.ingested_at[pos] = now
+        self.node[pos] = nodes
+        self.risk[pos] = risks
+        self.content[pos] = contents
+        self.size += count
+        return evicted
+
+    def expire(self, cutoff):
+        """Removes and returns every event ingested before `cutoff`."""
+        # Binary search over the (wrapped) logical order; ingest times are monotonic
+        low, high = 0, self.size
+        while low < high:
+            mid = (low + high) // 2
+            if self.ingested_at[(self.head + mid) % self.capacity] < cutoff:
+                low = mid + 1
+            else:
+                high = mid
+        return self.pop_oldest(low)
+
+    def pop_oldest(self, count):
+        pos = self._positions(0, min(count, self.size))
+        removed = (self.node[pos], self.risk[pos], self.content[pos].tolist())
+        self.content[pos] = None
+        self.head = (self.head + len(pos)) % self.capacity
+        self.size -= len(pos)
+        return removed
+
+
+class LiveCascadeTracker:
+    """
+    Incrementally maintained infection state for real share events over a
+    persistent SocialGraph. A node is "infected" while it has at least one
+    share inside the time window; its content-risk feature is the mean risk of
+    those shares. GNN predictions are refreshed only for the 2-hop
+    neighborhoods of nodes whose state changed since the last refresh.
+    """
+    def __init__(self, graph, gnn, window_seconds=WINDOW_SECONDS, max_window_events=MAX_WINDOW_EVENTS):
+        self.graph = graph
+        self.gnn = gnn
+        self.window_seconds = window_seconds
+        self.window = EventWindow(max_window_events)
+
+        index = graph.influence
+        self.nodes = index.nodes
+        # Events may name users by raw ID or display name ("42", "Titan-42")
+        self.user_to_idx = {}
+        for i, node_id in enumerate(self.nodes):
+            self.user_to_idx[str(node_id)] = i
+            self.user_to_idx[graph.G.nodes[node_id]['name']] = i
+
+        n = index.num_nodes
+        self.share_count = np.zeros(n, dtype=np.int64)
+        self.risk_sum = np.zeros(n)
+        self.dirty = np.zeros(n, dtype=bool)
+        self.content_counts = Counter()
+        self.events_applied = 0
+        self.events_dropped = 0
+
+        # Baseline predictions for the empty state (one pass over the graph)
+        self.predictions = self.gnn.predict_local(
+            graph, self.share_count > 0, self._risk_feature(), np.arange(n)
+        ) if n else np.zeros(0, dtype=np.float32)
+
+    def _risk_feature(self):
+        return np.divide(self.risk_sum, self.share_count,
+                         out=np.zeros(len(self.share_count)), where=self.share_count > 0)
+
+    def ingest(self, events, now=None):
+        """
+        Applies a batch of share events: dicts with 'user_id', 'content_id'
+        and optional 'risk' (default 0.5). Unknown users are counted and dropped.
+        """
+        now = time.time() if now is None else now
+        nodes, risks, contents = [], [], []
+        lookup = self.user_to_idx
+        for event in events:
+            idx = lookup.get(str(event.get('user_id')))
+            if idx is None:
+                self.events_dropped += 1
+                continue
+            nodes.append(idx)
+            risks.append(float(event.get('risk', 0.5)))
+            contents.append(str(event.get('content_id')))
+        if not nodes:
+            return 0
+
+        # A batch larger than the window keeps only its newest events, and only
+        # those are counted
+        overflow = len(nodes) - self.window.capacity
+        if overflow > 0:
+            nodes, risks, contents = nodes[overflow:], risks[overflow:], contents[overflow:]
+            self.events_dropped += overflow
+
+        nodes = np.asarray(nodes, dtype=np.int64)
+        risks = np.asarray(risks, dtype=np.float32)
+        self._remove(self.window.append(now, nodes, risks, contents))
+
+        np.add.at(self.share_count, nodes, 1)
+        np.add.at(self.risk_sum, nodes, risks)
+        self.content_counts.update(contents)
+        self.dirty[nodes] = True
+        self.events_applied += len(nodes)
+        return len(nodes)
+
+    def _remove(self, removed):
+        nodes, risks, contents = removed
+        if len(nodes) == 0:
+            return
+        np.subtract.at(self.share_count, nodes, 1)
+        np.subtract.at(self.risk_sum, nodes, risks)
+        self.content_counts.subtract(contents)
+        for content_id in set(contents):
+            if self.content_counts[content_id] <= 0:
+                del self.content_counts[content_id]
+        self.dirty[nodes] = True
+
+    def refresh(self, now=None):
+        """
+        Expires old events, re-runs the GNN on affected neighborhoods only and
+        returns the hot-spot payload (or None if nothing changed).
+        """
+        now = time.time() if now is None else now
+        self._remove(self.window.expire(now - self.window_seconds))
+
+        changed = np.flatnonzero(self.dirty)
+        if len(changed) == 0:
+            return None
+        self.dirty[changed] = False
+
+        # Node outputs depend on their 2-hop neighborhood: refresh exactly those
+        A = self.graph.influence.adjacency
+        hop1 = np.union1d(changed, A[changed].indices)
+        affected = np.union1d(hop1, A[hop1].indices)
+        self.predictions[affected] = self.gnn.predict_local(
+            self.graph, self.share_count > 0, self._risk_feature(), affected
+        )
+
+        return self._hot_spots(now, len(affected))
+
+    def _hot_spots(self, now, refreshed):
+        k = min(HOT_SPOTS, len(self.predictions))
+        top = np.argpartition(-self.predictions, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        top = top[np.argsort(-self.predictions[top])]
+
+        return {
+            "type": "hot_spots",
+            "timestamp": now,
+            "window_events": self.window.size,
+            "infected_nodes": int((self.share_count > 0).sum()),
+            "refreshed_nodes": int(refreshed),
+            "events_applied": self.events_applied,
+            "events_dropped": self.events_dropped,
+            "hot_spots": [
+                {
+                    "id": self.graph.G.nodes[self.nodes[i]]['name'],
+                    "probability": round(float(self.predictions[i]), 4),
+                    "shares": int(self.share_count[i]),
+                }
+                for i in top
+            ],
+            "top_contents": [
+                {"id": content_id, "shares": count}
+                for content_id, count in self.content_counts.most_common(5)
+            ],
+        }
+
+
+class EventFeed:
+    """In-process queue of share events (stand-in for a real stream)."""
+    def __init__(self, max_pending=MAX_PENDING_EVENTS):
+        self._events = deque(maxlen=max_pending)  # Overflow drops the oldest events
+
+    def put(self, event):
+        self._events.append(event)
+
+    def put_many(self, events):
+        events = list(events)
+        self._events.extend(events)
+        return len(events)
+
+    def drain(self, max_events=INGEST_BATCH_SIZE):
+        batch = []
+        events = self._events
+        while events and len(batch) < max_events:
+            batch.append(events.popleft())
+        return batch
+
+
+def tail_jsonl(path, feed, stop_event, poll_interval=0.2):
+    """
+    Follows a JSON-lines file (like `tail -f`) and pushes each event into `feed`.
+    A line is only parsed once its terminating newline has been written. If the
+    file does not exist yet, waits for it and then reads it from the start.
+    """
+    from_start = False
+    while not os.path.exists(path):
+        if not from_start:
+            print(f" [INGEST] Waiting for ingest file {path} ...")
+            from_start = True
+        if stop_event.wait(poll_interval):
+            return
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if not from_start:
+                f.seek(0, os.SEEK_END)
+            pending = ""  # Unterminated tail of the last read
+            while not stop_event.is_set():
+                chunk = f.read()
+                if not chunk:
+                    stop_event.wait(poll_interval)
+                    continue
+                *lines, pending = (pending + chunk).split("\n")
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        try:
+                            feed.put(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue  # Skip malformed lines
+    except OSError as exc:
+        print(f" [INGEST] Stopped tailing {path}: {exc}")
+
+
+class LiveIngestService:
+    """
+    Background thread: drains the feed into the tracker and, every
+    REFRESH_INTERVAL_SECONDS, refreshes predictions and hands the hot-spot
+    payload to `on_update` (called from the ingest thread). State is
+    in-process, so only one process may run it (enforced with a lock file).
+    """
+    def __init__(self, tracker, feed, on_update, ingest_file=None):
+        self.tracker = tracker
+        self.feed = feed
+        self.on_update = on_update
+        self.ingest_file = ingest_file
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock_file = None
+
+    @classmethod
+    def from_env(cls, on_update):
+        """Builds the persistent graph + tracker from the SCFCE_LIVE_* settings."""
+        graph = SocialGraph(num_nodes=LIVE_NUM_NODES, seed=LIVE_GRAPH_SEED)
+        gnn = GNNEngine(num_nodes=graph.G.number_of_nodes())
+        return cls(LiveCascadeTracker(graph, gnn), EventFeed(), on_update, LIVE_INGEST_FILE)
+
+    def start(self):
+        self._acquire_ownership()
+        self._threads = [threading.Thread(target=self._run, name="live-ingest", daemon=True)]
+        if self.ingest_file:
+            self._threads.append(threading.Thread(
+                target=tail_jsonl, args=(self.ingest_file, self.feed, self._stop),
+                name="live-ingest-tail", daemon=True,
+            ))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        if self._lock_file is not None:
+            self._lock_file.close()  # Releases the flock
+            self._lock_file = None
+
+    def _acquire_ownership(self):
+        """
+        The tracker, feed and subscribers live in this process, so exactly one
+        process may run live ingest (e.g. uvicorn --workers 1). A second one
+        fails fast instead of silently serving its own, diverging state.
+        """
+        if fcntl is None:
+            return
+        lock_file = open(INGEST_LOCK_PATH, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(
+                f"Live ingest is already running in another process (lock: {INGEST_LOCK_PATH}). "
+                "SCFCE_LIVE_INGEST=1 requires a single worker."
+            )
+        self._lock_file = lock_file
+
+    def _run(self):
+        next_refresh = time.monotonic()
+        while not self._stop.is_set():
+            batch = self.feed.drain()
+            if batch:
+                self.tracker.ingest(batch)
+
+            if time.monotonic() >= next_refresh:
+                payload = self.tracker.refresh()
+                if payload is not None:
+                    self.on_update(payload)
+                next_refresh = time.monotonic() + REFRESH_INTERVAL_SECONDS
+
+            if not batch:
+                self._stop.wait(0.01)
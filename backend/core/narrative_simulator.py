@@ -0,0 +1,130 @@
+import random
+import numpy as np
+from .simulator import SimulationEngine
+
+
+class CompetingNarrativesEngine(SimulationEngine):
+    """
+    Simulates several contents (e.g. a scam and its debunk) spreading over the
+    same graph in one pass. Every node carries a per-content state vector and
+    each content has its own neural risk score; the GNN and the transmission
+    step process all contents together as batched array operations.
+    """
+    def __init__(self, config):
+        super().__init__(config)
+
+        # 1. One Risk Score per content (content_text is narrative 0)
+        self.contents = [config.content_text] + list(config.competing_contents)
+        risks = [self.calculated_risk]
+        for text in config.competing_contents:
+            print(f" [SIM] Analyzing competing content: '{text}'")
+            risks.append(self.neural_text.calculate_risk(text))
+        self.calculated_risks = np.array(risks)
+        print(f" [SIM] Neural Risk Scores: {risks}")
+
+        # 2. Per-Node State Matrix: (num_nodes, num_contents), aligned with influence.nodes
+        index = self.graph.influence
+        self.nodes = index.nodes
+        self.state = np.zeros((index.num_nodes, len(self.contents)), dtype=bool)
+        self.transmission_counts = [{} for _ in self.contents]
+
+        # 3. Directed edge list (both directions) from the cached CSR adjacency
+        A = index.adjacency
+        self.edge_src = np.repeat(np.arange(index.num_nodes), np.diff(A.indptr))
+        self.edge_dst = A.indices.astype(np.int64)
+
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def step(self, timestep):
+        num_contents = len(self.contents)
+
+        # --- AI STEP: BATCHED GNN PREDICTION (all contents in one pass) ---
+        gnn_probs = self.gnn.predict_new_infections_batch(self.graph, self.state, self.calculated_risks)
+
+        # Transmission attempts: active source -> susceptible target, per content
+        src_state = self.state[self.edge_src]
+        dst_state = self.state[self.edge_dst]
+        attempts = src_state & ~dst_state
+        if self.config.exclusive_adoption:
+            attempts &= ~dst_state.any(axis=1, keepdims=True)
+        edge_idx, content_idx = np.nonzero(attempts)
+        targets = self.edge_dst[edge_idx]
+
+        # Combine the GNN's structural prediction with each content's Text Risk
+        final_prob = gnn_probs[targets, content_idx] * 0.8 + self.calculated_risks[content_idx] * 0.2
+        if self.ga_params:
+            final_prob /= self.ga_params['optimized_suppression']
+
+        hits = self.rng.random(len(edge_idx)) < final_prob
+        edge_idx, content_idx, targets = edge_idx[hits], content_idx[hits], targets[hits]
+
+        # Random order, then keep the first success per (node, content) --
+        # or per node when a node can adopt only one narrative
+        order = self.rng.permutation(len(edge_idx))
+        edge_idx, content_idx, targets = edge_idx[order], content_idx[order], targets[order]
+        keys = targets if self.config.exclusive_adoption else targets * num_contents + content_idx
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        edge_idx, content_idx, targets = edge_idx[first], content_idx[first], targets[first]
+
+        # Update State Matrix
+        self.state[targets, content_idx] = True
+
+        sources = self.edge_src[edge_idx]
+        return [
+            self._content_step(timestep, c, sources[content_idx == c], targets[content_idx == c])
+            for c in range(num_contents)
+        ]
+
+    def _content_step(self, timestep, c, sources, targets):
+        """Builds a SimulationStep-shaped dict for one content."""
+        counts = self.transmission_counts[c]
+        new_paths = []
+        for s, t in zip(sources, targets):
+            src_name = self.get_display_name(self.nodes[s])
+            new_paths.append([src_name, self.get_display_name(self.nodes[t])])
+            counts[src_name] = counts.get(src_name, 0) + 1
+
+        sorted_influencers = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:5]
+        reach = int(self.state[:, c].sum())
+
+        return {
+            "timestep": timestep,
+            "active_spreaders": reach,
+            "total_reach": reach,
+            "newly_activated": [self.get_display_name(self.nodes[t]) for t in targets],
+            "activation_paths": new_paths,
+            "live_top_5": [{"id": k, "count": v} for k, v in sorted_influencers]
+        }
+
+    def run(self):
+        # Initialize seed nodes for every content. Under exclusive adoption a
+        # node can hold only one narrative, so the seed sets are disjoint.
+        num_nodes = len(self.nodes)
+        num_contents = len(self.contents)
+        if self.config.exclusive_adoption:
+            num_seeds = min(self.config.seed_nodes, num_nodes // num_contents)
+            seeds = random.sample(range(num_nodes), num_seeds * num_contents)
+            for c in range(num_contents):
+                self.state[seeds[c * num_seeds:(c + 1) * num_seeds], c] = True
+        else:
+            num_seeds = min(self.config.seed_nodes, num_nodes)
+            for c in range(num_contents):
+                if num_seeds > 0:
+                    self.state[random.sample(range(num_nodes), num_seeds), c] = True
+
+        per_content = [[] for _ in self.contents]
+        for t in range(self.config.simulation_steps):
+            for c, step_data in enumerate(self.step(t)):
+                per_content[c].append(step_data)
+
+        # Graph 'state' reflects the primary content (sent to the frontend)
+        G = self.graph.G
+        for idx, node_id in enumerate(self.nodes):
+            G.nodes[node_id]['state'] = int(self.state[idx, 0])
+
+        self.narratives = [
+            {"content_text": text, "calculated_risk": float(risk), "results": history}
+            for text, risk, history in zip(self.contents, self.calculated_risks, per_content)
+        ]
+        return per_content[0]
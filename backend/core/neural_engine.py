@@ -1,17 +1,170 @@
 from transformers import pipeline
 import logging
+import os
+import shutil
+import tempfile
+import numpy as np
 
 # Suppress heavy TensorFlow/PyTorch logs
 logging.getLogger("transformers").setLevel(logging.ERROR)
 
-class NeuralRiskAnalyzer:
-    def __init__(self):
-        print(" [NEURAL] Loading Transformer Model... (This happens once)")
+# CONFIG
+MODEL_NAME = "valhalla/distilbart-mnli-12-1"
+# "pytorch" = eager transformers pipeline, "onnx" = int8-quantized ONNX Runtime
+NEURAL_BACKEND = os.environ.get("SCFCE_NEURAL_BACKEND", "pytorch")
+ONNX_CACHE_DIR = os.environ.get("SCFCE_ONNX_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".onnx_cache"))
+
+# Define the categories we want the NN to look for
+CANDIDATE_LABELS = ["crypto scam", "urgent financial threat", "suspicious link", "neutral conversation", "safe news"]
+RISK_LABELS = ["crypto scam", "urgent financial threat", "suspicious link"]
+HYPOTHESIS_TEMPLATE = "This example is {}."  # Same default as the zero-shot pipeline
+
+# Local fixture set for the PyTorch <-> ONNX accuracy-parity check
+PARITY_FIXTURES = [
+    "Urgent! Send 1000 ETH to this wallet instantly to win!",
+    "Your bank account is locked. Verify your password at http://secure-login.example.ru now.",
+    "Double your Bitcoin in 24 hours, guaranteed returns, DM me.",
+    "Final notice: pay the outstanding tax balance today or face arrest.",
+    "Click this link to claim your free gift card before it expires.",
+    "Hey, are we still meeting for lunch tomorrow?",
+    "The city council approved the new park budget on Tuesday.",
+    "Scientists published a new study on coral reef recovery.",
+    "Happy birthday! Hope you have a great day.",
+    "The weather will be sunny with light winds this weekend.",
+]
+PARITY_TOLERANCE = 0.05
+
+# Loaded models are expensive; keep one per backend per process
+_CLASSIFIER_CACHE = {}
+
+
+class PyTorchZeroShotClassifier:
+    """Eager transformers pipeline: one NLI forward pass per candidate label."""
+    def __init__(self, model_name=MODEL_NAME):
         # We use a 'Zero-Shot Classification' pipeline.
         # It allows us to classify text into arbitrary categories without training.
         # 'facebook/bart-large-mnli' is a standard, powerful model for this.
-     # valhalla/distilbart-mnli-12-1 is much smaller (~300MB)
-        self.classifier = pipeline("zero-shot-classification", model="valhalla/distilbart-mnli-12-1")
+        # valhalla/distilbart-mnli-12-1 is much smaller (~300MB)
+        self.pipeline = pipeline("zero-shot-classification", model=model_name)
+
+    def classify(self, text, candidate_labels):
+        """Returns a mapping of Label -> Score (scores sum to 1)."""
+        result = self.pipeline(text, candidate_labels, hypothesis_template=HYPOTHESIS_TEMPLATE)
+        return {label: score for label, score in zip(result['labels'], result['scores'])}
+
+
+class OnnxZeroShotClassifier:
+    """
+    Int8 dynamically-quantized ONNX export of the NLI model, run with ONNX Runtime.
+    All candidate-label hypotheses are scored in ONE batched session call.
+    """
+    def __init__(self, model_name=MODEL_NAME, cache_dir=ONNX_CACHE_DIR):
+        # Optional dependencies: only needed when NEURAL_BACKEND == "onnx"
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        config = AutoConfig.from_pretrained(model_name)
+        label2id = {label.lower(): idx for label, idx in config.label2id.items()}
+        self.entailment_id = label2id.get("entailment", 2)
+
+        model_path = self._export_quantized(model_name, cache_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _export_quantized(self, model_name, cache_dir):
+        """
+        Exports to ONNX and quantizes once; later loads reuse the cached file.
+        Work happens in a private temp directory and the finished model is
+        os.replace()d into place, so concurrent workers never read a partial file.
+        """
+        safe_name = model_name.replace("/", "__")
+        int8_path = os.path.join(cache_dir, f"{safe_name}.int8.onnx")
+        if os.path.exists(int8_path):
+            return int8_path
+
+        import torch
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        from transformers import AutoModelForSequenceClassification
+
+        print(" [NEURAL] Exporting model to ONNX + int8 quantization (first run only)...")
+        os.makedirs(cache_dir, exist_ok=True)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.config.use_cache = False  # No past_key_values / decoder cache outputs
+        model.eval()
+
+        class LogitsOnly(torch.nn.Module):
+            # The exported graph has a single output; encoder states etc. are dropped
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+        tmp_dir = tempfile.mkdtemp(prefix=f".{safe_name}.", dir=cache_dir)
+        try:
+            fp32_path = os.path.join(tmp_dir, "model.onnx")
+            tmp_int8_path = os.path.join(tmp_dir, "model.int8.onnx")
+
+            dummy = self.tokenizer(["premise"], ["hypothesis"], return_tensors="pt")
+            dynamic_axes = {"input_ids": {0: "batch", 1: "sequence"},
+                            "attention_mask": {0: "batch", 1: "sequence"},
+                            "logits": {0: "batch"}}
+            with torch.no_grad():
+                torch.onnx.export(
+                    LogitsOnly(model),
+                    (dummy["input_ids"], dummy["attention_mask"]),
+                    fp32_path,
+                    input_names=["input_ids", "attention_mask"],
+                    output_names=["logits"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                    dynamo=False,  # TorchScript exporter; dynamic_axes is ignored by the dynamo path
+                )
+
+            quantize_dynamic(fp32_path, tmp_int8_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_int8_path, int8_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return int8_path
+
+    def classify(self, text, candidate_labels):
+        """Returns a mapping of Label -> Score (scores sum to 1)."""
+        hypotheses = [HYPOTHESIS_TEMPLATE.format(label) for label in candidate_labels]
+        encoded = self.tokenizer([text] * len(hypotheses), hypotheses,
+                                 padding=True, truncation="only_first", return_tensors="np")
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0]
+
+        # Single-label zero-shot: softmax of entailment logits across labels
+        entail = logits[:, self.entailment_id]
+        scores = np.exp(entail - entail.max())
+        scores /= scores.sum()
+        return {label: float(score) for label, score in zip(candidate_labels, scores)}
+
+
+CLASSIFIER_BACKENDS = {
+    "pytorch": PyTorchZeroShotClassifier,
+    "onnx": OnnxZeroShotClassifier,
+}
+
+
+def load_classifier(backend):
+    if backend not in CLASSIFIER_BACKENDS:
+        raise ValueError(f"Unknown neural backend '{backend}'. Choose from: {list(CLASSIFIER_BACKENDS)}")
+    if backend not in _CLASSIFIER_CACHE:
+        _CLASSIFIER_CACHE[backend] = CLASSIFIER_BACKENDS[backend]()
+    return _CLASSIFIER_CACHE[backend]
+
+
+class NeuralRiskAnalyzer:
+    def __init__(self, backend=None):
+        self.backend = backend or NEURAL_BACKEND
+        print(f" [NEURAL] Loading Transformer Model ({self.backend})... (This happens once)")
+        self.classifier = load_classifier(self.backend)
         print(" [NEURAL] Model Loaded Successfully.")
 
     def calculate_risk(self, text):
@@ -19,31 +172,37 @@ class NeuralRiskAnalyzer:
         Uses a Neural Network to determine if the text is a scam/risk.
         Returns a float between 0.0 (Safe) and 1.0 (High Risk).
         """
-        # Define the categories we want the NN to look for
-        candidate_labels = ["crypto scam", "urgent financial threat", "suspicious link", "neutral conversation", "safe news"]
-        
-        # Run the classification
-        result = self.classifier(text, candidate_labels)
-        
-        # Extract scores
-        labels = result['labels']
-        scores = result['scores']
-        
         # Create a mapping of Label -> Score
-        score_map = {label: score for label, score in zip(labels, scores)}
-        
+        score_map = self.classifier.classify(text, CANDIDATE_LABELS)
+
         # Calculate weighted risk
         # If the NN thinks it's a "scam" or "threat", risk goes up.
-        scam_score = score_map.get("crypto scam", 0)
-        threat_score = score_map.get("urgent financial threat", 0)
-        suspicious_score = score_map.get("suspicious link", 0)
-        
         # Max risk detected among negative categories
-        risk_level = max(scam_score, threat_score, suspicious_score)
-        
+        risk_level = max(score_map.get(label, 0) for label in RISK_LABELS)
+
         return round(risk_level, 2)
 
+
+def check_backend_parity(texts=PARITY_FIXTURES, tolerance=PARITY_TOLERANCE):
+    """
+    Compares ONNX risk scores against the PyTorch reference on a fixture set.
+    Returns (passed, rows) where rows are (text, pytorch_risk, onnx_risk).
+    """
+    reference = NeuralRiskAnalyzer(backend="pytorch")
+    candidate = NeuralRiskAnalyzer(backend="onnx")
+    rows = [(text, reference.calculate_risk(text), candidate.calculate_risk(text)) for text in texts]
+    passed = all(abs(ref - onnx) <= tolerance for _, ref, onnx in rows)
+    return passed, rows
+
 # Simple test if run directly
 if __name__ == "__main__":
+    import sys
+    if "--parity" in sys.argv:
+        passed, rows = check_backend_parity()
+        for text, ref, onnx in rows:
+            print(f"{ref:.2f}  {onnx:.2f}  {text}")
+        print("PARITY OK" if passed else f"PARITY FAILED (tolerance {PARITY_TOLERANCE})")
+        sys.exit(0 if passed else 1)
+
     analyzer = NeuralRiskAnalyzer()
-    print(analyzer.calculate_risk("Urgent! Send 1000 ETH to this wallet instantly to win!"))
\ No newline at end of file
+    print(analyzer.calculate_risk("Urgent! Send 1000 ETH to this wallet instantly to win!"))
@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# CONFIG
+RUN_DB_PATH = os.environ.get("SCFCE_RUN_DB", os.path.join(os.path.dirname(os.path.dirname(__file__)), "runs.db"))
+MAX_STORED_RUNS = 32     # Least recently used runs are evicted first
+MAX_PAGE_SIZE = 500      # Upper bound on steps returned per range query
+LAST_USED_REFRESH_SECONDS = 60  # Reads bump a run's LRU timestamp at most this often
+
+
+class StoredRun:
+    """
+    One simulation run, encoded against integer node indices.
+
+    Display names are stored once in `names`; every step keeps only indices:
+      - newly_activated: [target_idx, ...]
+      - sources:         [source_idx, ...] aligned with newly_activated
+                         (activation path i is sources[i] -> newly_activated[i])
+      - live_top_5:      [{"id": idx, "count": n}, ...]
+
+    Steps stay in the store and are loaded per page.
+    """
+    def __init__(self, store, run_id, config, metadata, names, total_steps):
+        self.store = store
+        self.run_id = run_id
+        self.config = config
+        self.metadata = metadata
+        self.names = names
+        self.total_steps = total_steps
+
+    def page(self, start=0, limit=50):
+        """Encoded steps [start, start + limit) plus the names they reference."""
+        limit = max(0, min(limit, MAX_PAGE_SIZE))
+        start = max(0, start)
+        steps = self.store.load_steps(self.run_id, start, limit)
+
+        referenced = set()
+        for step in steps:
+            referenced.update(step["newly_activated"])
+            referenced.update(step["sources"])
+            referenced.update(entry["id"] for entry in step["live_top_5"])
+
+        return {
+            "run_id": self.run_id,
+            "start": start,
+            "total_steps": self.total_steps,
+            "names": {idx: self.names[idx] for idx in sorted(referenced)},
+            "steps": steps,
+        }
+
+    def decode_step(self, position):
+        """Rebuilds a SimulationStep-shaped dict (display names) for one step."""
+        step = self.store.load_steps(self.run_id, position, 1)[0]
+        names = self.names
+        return {
+            "timestep": step["timestep"],
+            "active_spreaders": step["active_spreaders"],
+            "total_reach": step["total_reach"],
+            "newly_activated": [names[i] for i in step["newly_activated"]],
+            "activation_paths": [[names[s], names[t]] for s, t in zip(step["sources"], step["newly_activated"])],
+            "live_top_5": [{"id": names[e["id"]], "count": e["count"]} for e in step["live_top_5"]],
+        }
+
+
+class RunStore:
+    """
+    Bounded store of simulation runs keyed by run ID, kept in a local SQLite
+    file so every worker process can serve runs created by any other.
+    """
+    def __init__(self, path=RUN_DB_PATH, max_runs=MAX_STORED_RUNS):
+        self.path = path
+        self.max_runs = max_runs
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY,"
+                " last_used REAL NOT NULL,"
+                " config TEXT NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " names TEXT NOT NULL,"
+                " total_steps INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_steps ("
+                " run_id TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " step TEXT NOT NULL,"
+                " PRIMARY KEY (run_id, position))"
+            )
+
+    def _connect(self):
+        # One connection per thread (sqlite3 connections are not thread-safe)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            self._local.conn = conn
+        return conn
+
+    def save(self, config, metadata, names, history):
+        """
+        Encodes a run's history (display-name steps) and stores it. `config`
+        is a plain dict. Returns the run ID.
+        """
+        name_to_idx = {name: i for i, name in enumerate(names)}
+        run_id = uuid.uuid4().hex
+        steps = [
+            (run_id, position, json.dumps(_encode_step(step, name_to_idx)))
+            for position, step in enumerate(history)
+        ]
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, last_used, config, metadata, names, total_steps) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, time.time(), json.dumps(config), json.dumps(metadata, default=_to_json),
+                 json.dumps(list(names)), len(steps)),
+            )
+            conn.executemany("INSERT INTO run_steps (run_id, position, step) VALUES (?, ?, ?)", steps)
+            self._evict(conn)
+        return run_id
+
+    def _evict(self, conn):
+        stale = [row[0] for row in conn.execute(
+            "SELECT run_id FROM runs ORDER BY last_used DESC LIMIT -1 OFFSET ?", (self.max_runs,)
+        )]
+        for run_id in stale:
+            conn.execute("DELETE FROM run_steps WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def get(self, run_id):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT config, metadata, names, total_steps, last_used FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        config, metadata, names, total_steps, last_used = row
+
+        # Page reads stay read-only; the write lock (shared by every worker) is
+        # only taken when the LRU timestamp is actually stale
+        now = time.time()
+        if now - last_used > LAST_USED_REFRESH_SECONDS:
+            with conn:
+                conn.execute("UPDATE runs SET last_used = ? WHERE run_id = ?", (now, run_id))
+        return StoredRun(self, run_id, json.loads(config), json.loads(metadata), json.loads(names), total_steps)
+
+    def load_steps(self, run_id, start, limit):
+        rows = self._connect().execute(
+            "SELECT step FROM run_steps WHERE run_id = ? AND position >= ? ORDER BY position LIMIT ?",
+            (run_id, start, limit),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def _to_json(value):
+    # numpy scalars/arrays (e.g. GA parameters) -> plain Python values
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def _encode_step(step, name_to_idx):
+    paths = step["activation_paths"]
+    return {
+        "timestep": step["timestep"],
+        "active_spreaders": step["active_spreaders"],
+        "total_reach": step["total_reach"],
+        "newly_activated": [name_to_idx[tgt] for _, tgt in paths],
+        "sources": [name_to_idx[src] for src, _ in paths],
+        "live_top_5": [{"id": name_to_idx[e["id"]], "count": e["count"]} for e in step["live_top_5"]],
+    }
+
+
+# Store shared by every worker process (same SQLite file)
+run_store = RunStore()
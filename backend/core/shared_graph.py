@@ -0,0 +1,87 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# CONFIG
+# /dev/shm is RAM-backed on Linux, so mmap'd files there are true shared memory
+_DEFAULT_DIR = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "scfce_graphs")
+SHARED_GRAPH_DIR = os.environ.get("SCFCE_SHARED_GRAPH_DIR", _DEFAULT_DIR)
+MAX_SHARED_GRAPHS = int(os.environ.get("SCFCE_MAX_SHARED_GRAPHS", "16"))
+
+
+# Part of every key. Bump whenever the published arrays or the algorithms that
+# compute them change: /dev/shm entries outlive deploys, and a new build must
+# never attach arrays written by an old one.
+FORMAT_VERSION = 2
+
+
+def graph_fingerprint(nodes, edges, trust, params=None):
+    """
+    Content hash of a graph's structure + trust (and the build `params` that
+    shape the derived arrays): equal graphs share one entry.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"scfce-graph-v{FORMAT_VERSION}".encode("utf-8"))
+    digest.update(repr(sorted((params or {}).items())).encode("utf-8"))
+    digest.update(repr(nodes).encode("utf-8"))
+    digest.update(np.ascontiguousarray(edges).tobytes())
+    digest.update(np.ascontiguousarray(trust).tobytes())
+    return digest.hexdigest()
+
+
+def attach(key):
+    """
+    Maps a published graph read-only into this process (zero-copy).
+    Returns {name: array} or None if no worker has published it yet.
+    """
+    path = os.path.join(SHARED_GRAPH_DIR, key)
+    if not os.path.isdir(path):
+        return None
+    try:
+        os.utime(path)  # Recently used entries survive eviction
+        return {
+            fname[:-4]: np.load(os.path.join(path, fname), mmap_mode="r")
+            for fname in os.listdir(path) if fname.endswith(".npy")
+        }
+    except (OSError, ValueError):
+        # Evicted or half-removed by another worker; caller rebuilds
+        return None
+
+
+def publish(key, arrays):
+    """
+    Writes arrays once for all workers. The directory is renamed into place
+    atomically, so concurrent publishers of the same graph are harmless.
+    Returns the attached (mmap'd) arrays so this process shares them too.
+    """
+    os.makedirs(SHARED_GRAPH_DIR, exist_ok=True)
+    final_path = os.path.join(SHARED_GRAPH_DIR, key)
+    if not os.path.isdir(final_path):
+        tmp_path = tempfile.mkdtemp(prefix=f".{key}.", dir=SHARED_GRAPH_DIR)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+        try:
+            os.rename(tmp_path, final_path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)  # Another worker won the race
+        _evict_oldest()
+    return attach(key) or arrays
+
+
+def _evict_oldest():
+    """Keeps at most MAX_SHARED_GRAPHS entries. Workers that already mapped an
+    evicted graph keep their mapping (POSIX unlink semantics)."""
+    entries = []
+    for name in os.listdir(SHARED_GRAPH_DIR):
+        path = os.path.join(SHARED_GRAPH_DIR, name)
+        if name.startswith("."):
+            continue
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except OSError:
+            continue  # Removed concurrently
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - MAX_SHARED_GRAPHS)]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -16,7 +16,8 @@ class SimulationEngine:
         self.graph = SocialGraph(
             num_nodes=config.num_nodes,          # Slider Value
             custom_data=config.custom_graph,     # Uploaded JSON
-            blocked_ids=config.blocked_node_ids  # Clicked/Blocked Nodes
+            blocked_ids=config.blocked_node_ids, # Clicked/Blocked Nodes
+            seed=config.graph_seed               # Reproducible (shareable) random graph
         )
         
         self.ga = GeneticOptimizer()
@@ -37,6 +38,7 @@ class SimulationEngine:
         self.display_names = {}
         self._generate_display_names()
         self.transmission_counts = {} 
+        self.narratives = [] # Per-content results (competing narratives mode only)
 
         # 6. Genetic Optimization (Optional)
         self.ga_params = None
@@ -46,28 +48,10 @@ class SimulationEngine:
 
     def _generate_display_names(self):
         """Creates a mapping from ID (int) -> Name (str) based on influence."""
+        # Tier names come from the graph's precomputed influence index
         G = self.graph.G
-        degrees = dict(G.degree())
-        
-        # Sort nodes by influence (highest connections first)
-        sorted_nodes = sorted(degrees, key=degrees.get, reverse=True)
-        total = len(sorted_nodes)
-        
-        titan_limit = int(total * 0.02)
-        macro_limit = int(total * 0.12)
-        
-        for i, node_id in enumerate(sorted_nodes):
-            # If custom data provided specific names, use them. Otherwise generate Titan/User names.
-            if 'name' in G.nodes[node_id]:
-                self.display_names[node_id] = G.nodes[node_id]['name']
-            else:
-                if i < titan_limit:
-                    name = f"Titan-{node_id}"
-                elif i < macro_limit:
-                    name = f"Macro-{node_id}"
-                else:
-                    name = f"User-{node_id}"
-                self.display_names[node_id] = name
+        for node_id in G.nodes():
+            self.display_names[node_id] = G.nodes[node_id]['name']
 
     def get_display_name(self, node_id):
         return self.display_names.get(node_id, f"Node-{node_id}")
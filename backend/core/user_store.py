@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+# CONFIG
+USER_STORE_BACKEND = os.environ.get("SCFCE_USER_STORE", "sqlite")  # "sqlite" or "memory"
+USER_DB_PATH = os.environ.get("SCFCE_USER_DB", os.path.join(os.path.dirname(os.path.dirname(__file__)), "users.db"))
+
+
+class UserStore(ABC):
+    """
+    Pluggable user storage. Users are plain dicts:
+    {"username": str, "hashed_password": str, "role": str}
+    """
+    @abstractmethod
+    def get_user(self, username):
+        """Returns the user dict, or None if unknown."""
+
+    @abstractmethod
+    def add_user(self, username, hashed_password, role="analyst"):
+        """Creates or replaces a user."""
+
+
+class InMemoryUserStore(UserStore):
+    """Dict-backed store (tests, single-process demos); not shared between workers."""
+    def __init__(self):
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def get_user(self, username):
+        with self._lock:
+            user = self._users.get(username)
+            return dict(user) if user else None
+
+    def add_user(self, username, hashed_password, role="analyst"):
+        with self._lock:
+            self._users[username] = {"username": username, "hashed_password": hashed_password, "role": role}
+
+
+class SQLiteUserStore(UserStore):
+    """Local SQLite store; safe to share between threads and worker processes."""
+    def __init__(self, path=USER_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " username TEXT PRIMARY KEY,"
+                " hashed_password TEXT NOT NULL,"
+                " role TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        # One connection per thread (sqlite3 connections are not thread-safe)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get_user(self, username):
+        row = self._connect().execute(
+            "SELECT username, hashed_password, role FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add_user(self, username, hashed_password, role="analyst"):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO users (username, hashed_password, role) VALUES (?, ?, ?)",
+                (username, hashed_password, role),
+            )
+
+
+USER_STORE_BACKENDS = {
+    "sqlite": SQLiteUserStore,
+    "memory": InMemoryUserStore,
+}
+
+
+def create_user_store(backend=None):
+    backend = backend or USER_STORE_BACKEND
+    if backend not in USER_STORE_BACKENDS:
+        raise ValueError(f"Unknown user store '{backend}'. Choose from: {list(USER_STORE_BACKENDS)}")
+    return USER_STORE_BACKENDS[backend]()
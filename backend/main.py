@@ -1,24 +1,43 @@
-from fastapi import FastAPI, Depends, WebSocket, HTTPException, status
+from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect, HTTPException, status, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 import networkx as nx
 from fastapi.responses import StreamingResponse
 from core.report_generator import generate_pdf 
-from typing import Dict, Any # Import the new helper
+from typing import Dict, Any, List # Import the new helper
+import asyncio
 import io
+from contextlib import asynccontextmanager
+import os
 
 # --- FIXED IMPORTS BELOW ---
 # 1. Logic comes from auth.py
-from core.auth import create_access_token, get_current_user, fake_users_db, verify_password
+from core.auth import create_access_token, get_current_user, authenticate_user
 
 # 2. Data Models come from data_schemas.py
-from models.data_schemas import SimulationConfig, SimulationResponse, Token, UserLogin
+from models.data_schemas import SimulationConfig, SimulationResponse, Token, UserLogin, RunStepsPage, ShareEvent, IngestResult
 
 # 3. Simulator engine
 from core.simulator import SimulationEngine
+from core.narrative_simulator import CompetingNarrativesEngine
+from core.event_simulator import EventDrivenSimulationEngine
+
+# 4. Server-side run storage
+from core.run_store import run_store, MAX_PAGE_SIZE
+
+# 5. Continuous ingest (live cascades), enabled with SCFCE_LIVE_INGEST=1
+from core.ingest_engine import LiveIngestService
 # ---------------------------
 
-app = FastAPI(title="SCFCE Platform")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_live_ingest()
+    try:
+        yield
+    finally:
+        stop_live_ingest()
+
+app = FastAPI(title="SCFCE Platform", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +49,9 @@ app.add_middleware(
 
 @app.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = fake_users_db.get(form_data.username)
-    if not user or not verify_password(form_data.password, user['hashed_password']):
+    # Store lookup and bcrypt run in thread pools, not on the event loop
+    user = await authenticate_user(form_data.username, form_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -40,40 +60,135 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     access_token = create_access_token(data={"sub": user['username']})
     return {"access_token": access_token, "token_type": "bearer"}
 
+def select_engine(config: SimulationConfig):
+    if config.competing_contents:
+        return CompetingNarrativesEngine
+    if config.engine == "event_driven":
+        return EventDrivenSimulationEngine
+    return SimulationEngine
+
 @app.post("/simulate", response_model=SimulationResponse)
 def run_simulation(config: SimulationConfig, current_user: dict = Depends(get_current_user)):
     
-    engine = SimulationEngine(config)
+    engine = select_engine(config)(config)
     results = engine.run()
     
     # Convert graph for Frontend
     graph_data = nx.node_link_data(engine.graph.G)
     
+    metadata = {
+        "calculated_risk": engine.calculated_risk,
+        "strategy_used": config.strategy,
+        "ga_params": engine.ga_params
+    }
+
+    # Store the run once, encoded against node indices, for paginated replay/reports
+    names = [engine.get_display_name(n) for n in engine.graph.influence.nodes]
+    run_id = run_store.save(config.model_dump(), metadata, names, results)
+
+    # The first narrative is the primary content (same history as `results`)
+    narratives = []
+    for i, narrative in enumerate(engine.narratives):
+        narrative_run_id = run_id if i == 0 else run_store.save(
+            config.model_dump(), {**metadata, "calculated_risk": narrative["calculated_risk"]}, names, narrative["results"]
+        )
+        narratives.append({
+            **narrative,
+            "results": narrative["results"] if config.inline_results else [],
+            "run_id": narrative_run_id,
+        })
+
     return {
-        "metadata": {
-            "calculated_risk": engine.calculated_risk,
-            "strategy_used": config.strategy,
-            "ga_params": engine.ga_params
-        },
-        "results": results,
-        "graph_topology": graph_data
+        "metadata": metadata,
+        "results": results if config.inline_results else [],
+        "graph_topology": graph_data,
+        "narratives": narratives,
+        "run_id": run_id
     }
 
+@app.get("/runs/{run_id}/steps", response_model=RunStepsPage)
+def get_run_steps(
+    run_id: str,
+    start: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user),
+):
+    run = run_store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown or expired run_id")
+    return run.page(start, limit)
+
+# --- LIVE INGEST: share events -> incremental state -> hot spots over WebSocket ---
+# The live tracker is in-process state: run the server with a single worker when
+# SCFCE_LIVE_INGEST=1 (a second worker refuses to start).
+LIVE_INGEST_ENABLED = os.environ.get("SCFCE_LIVE_INGEST") == "1"
+LIVE_SUBSCRIBER_QUEUE = 8 # Slow clients only ever see the latest updates
+live_service = None
+live_subscribers = set()
+
+def _fan_out(payload):
+    for queue in list(live_subscribers):
+        if queue.full():
+            queue.get_nowait() # Drop the oldest update for slow clients
+        queue.put_nowait(payload)
+
+def start_live_ingest():
+    global live_service
+    if not LIVE_INGEST_ENABLED:
+        return
+    loop = asyncio.get_running_loop()
+    # on_update runs on the ingest thread; hand payloads over to the event loop
+    live_service = LiveIngestService.from_env(on_update=lambda payload: loop.call_soon_threadsafe(_fan_out, payload))
+    live_service.start()
+
+def stop_live_ingest():
+    if live_service is not None:
+        live_service.stop()
+
+@app.post("/ingest/events", response_model=IngestResult)
+def ingest_events(events: List[ShareEvent], current_user: dict = Depends(get_current_user)):
+    if live_service is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Live ingest is disabled")
+    accepted = live_service.feed.put_many(event.model_dump() for event in events)
+    return {"accepted": accepted}
+
 @app.websocket("/ws/live-feed")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     await websocket.send_text("Connected to SCFCE Live Stream")
-    await websocket.close()
+    if live_service is None:
+        await websocket.close()
+        return
+
+    queue = asyncio.Queue(maxsize=LIVE_SUBSCRIBER_QUEUE)
+    live_subscribers.add(queue)
+    try:
+        while True:
+            await websocket.send_json(await queue.get())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_subscribers.discard(queue)
 
 @app.post("/generate_pdf_report")
 def generate_pdf_report(request_data: Dict[str, Any]):
-    # Extract data from the request body
-    results = request_data.get('results')
-    config_dict = request_data.get('config')
-    
-    # Reconstruct config object (simple version)
-    from models.data_schemas import SimulationConfig
-    config = SimulationConfig(**config_dict)
+    run_id = request_data.get('run_id')
+    if run_id:
+        # Stored run: only the metadata and the final step are needed
+        run = run_store.get(run_id)
+        if run is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown or expired run_id")
+        if run.total_steps == 0:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Run has no steps to report")
+        results = {"metadata": run.metadata, "results": [run.decode_step(run.total_steps - 1)]}
+        config = SimulationConfig(**run.config)
+    else:
+        # Extract data from the request body
+        results = request_data.get('results')
+        config_dict = request_data.get('config')
+        
+        # Reconstruct config object (simple version)
+        config = SimulationConfig(**config_dict)
 
     # Generate PDF
     pdf = generate_pdf(results, config)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, model_validator
+from typing import List, Dict, Any, Optional, Literal, Union
 
 # --- Auth Models ---
 class Token(BaseModel):
@@ -36,6 +36,28 @@ class SimulationConfig(BaseModel):
     # --- NEW FEATURES ADDED ---
     custom_graph: Optional[CustomGraphData] = None # User uploaded data
     blocked_node_ids: List[str] = [] # List of nodes to REMOVE before sim
+    graph_seed: Optional[int] = None # Same seed = same random graph (shared across workers)
+
+    # --- ENGINE SELECTION ---
+    engine: Literal["stepwise", "event_driven"] = "stepwise" # Full-graph scan or frontier only
+    continuous_time: bool = False # event_driven only: exponential instead of per-step delays
+
+    # --- COMPETING NARRATIVES MODE ---
+    # Extra contents (e.g. a debunk) spreading concurrently with content_text.
+    # Runs on the stepwise engine only; combining it with event_driven is rejected.
+    competing_contents: List[str] = []
+    exclusive_adoption: bool = True # A node adopts at most one narrative
+
+    # --- RESPONSE SIZE ---
+    # False = results (and narrative results) are only stored server-side
+    # (fetch via /runs/{run_id}/steps)
+    inline_results: bool = True
+
+    @model_validator(mode="after")
+    def check_engine_mode(self):
+        if self.competing_contents and self.engine != "stepwise":
+            raise ValueError("competing_contents is only supported with engine='stepwise'")
+        return self
 
 # --- Helper Model for Leaderboard ---
 class TopInfluencer(BaseModel):
@@ -54,8 +76,49 @@ class SimulationStep(BaseModel):
     
     live_top_5: List[TopInfluencer]
 
+# --- Per-Content Output (Competing Narratives Mode) ---
+class NarrativeResult(BaseModel):
+    content_text: str
+    calculated_risk: float
+    results: List[SimulationStep] = [] # Empty when inline_results is False
+    run_id: Optional[str] = None # Stored run holding this narrative's steps
+
 # --- Final API Response ---
 class SimulationResponse(BaseModel):
     metadata: Dict[str, Any]
     graph_topology: Dict[str, Any]
-    results: List[SimulationStep]
\ No newline at end of file
+    results: List[SimulationStep]
+    narratives: List[NarrativeResult] = [] # Filled only in competing narratives mode
+    run_id: Optional[str] = None # Server-side handle for paginated step queries
+
+# --- Stored Runs (Integer-Encoded, Paginated) ---
+class EncodedInfluencer(BaseModel):
+    id: int
+    count: int
+
+class EncodedStep(BaseModel):
+    timestep: int
+    active_spreaders: int
+    total_reach: int
+
+    # Node indices; activation path i is sources[i] -> newly_activated[i]
+    newly_activated: List[int]
+    sources: List[int]
+
+    live_top_5: List[EncodedInfluencer]
+
+class RunStepsPage(BaseModel):
+    run_id: str
+    start: int
+    total_steps: int
+    names: Dict[int, str] # Index -> display name, only for indices used in this page
+    steps: List[EncodedStep]
+
+# --- Live Ingest (Continuous Mode) ---
+class ShareEvent(BaseModel):
+    user_id: Union[int, str] # Graph node ID or display name (42, "42", "Titan-42")
+    content_id: str
+    risk: float = 0.5 # Content risk score, if known upstream
+
+class IngestResult(BaseModel):
+    accepted: int
@@ -10,7 +10,7 @@ import {
 import { CpuChipIcon, ArrowsRightLeftIcon, BeakerIcon, ChartBarIcon, ShieldCheckIcon, UserGroupIcon } from '@heroicons/react/24/outline';
 import Controls from './Controls';
 import NetworkViz from './NetworkViz';
-import { login, runSimulation } from '../services/api';
+import { login, runSimulation, fetchRunSteps } from '../services/api';
 
 // Stat Card Component
 const StatCard = ({ icon: Icon, title, value, subtext, colorClass }) => (
@@ -42,7 +42,10 @@ const Dashboard = () => {
         risk_tolerance: 0.5,
         strategy: "fuzzy_adaptive",
         custom_graph: null,
-        blocked_node_ids: []
+        blocked_node_ids: [],
+        // One random graph per session: re-runs (e.g. after blocking nodes) use the
+        // same graph, and the backend shares its arrays across workers
+        graph_seed: Math.floor(Math.random() * 2 ** 31)
     });
 
     const PLAYBACK_SPEED_MS = 1500; 
@@ -69,7 +72,9 @@ const Dashboard = () => {
         setIsPlaying(false); setCurrentStep(0); setLiveTop5([]); 
         try {
             const runConfig = { ...config, blocked_node_ids: blockedNodes };
-            const res = await runSimulation(token, runConfig);
+            // Steps stay server-side; the replay pages them in from the stored run
+            const res = await runSimulation(token, { ...runConfig, inline_results: false });
+            res.results = await fetchRunSteps(token, res.run_id);
             setData(res);
             if (res.results?.[0]?.live_top_5) setLiveTop5(res.results[0].live_top_5);
             setIsPlaying(true); 
@@ -95,10 +100,12 @@ const Dashboard = () => {
     const downloadReport = async () => {
         if(!data) return;
         try {
-            const payload = { results: data, config: config };
-            const response = await fetch('http://localhost:8000/generate_pdf_report', {
+            const requestReport = (payload) => fetch('http://localhost:8000/generate_pdf_report', {
                 method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(payload)
             });
+            // Stored runs are addressed by ID; if the run has expired, send the results we already hold
+            let response = data.run_id ? await requestReport({ run_id: data.run_id }) : null;
+            if (!response || response.status === 404) response = await requestReport({ results: data, config: config });
             if (!response.ok) throw new Error("PDF generation failed");
             const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
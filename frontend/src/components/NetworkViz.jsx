@@ -37,24 +37,32 @@ const NetworkViz = ({ graphData, activePaths, liveTop5, onNodeClick, blockedNode
             let size = 4;
             let newId = `User-${node.id}`; // Default Name
 
+            // Prefer the backend's tier (its names appear in activation_paths);
+            // fall back to degree rank for graphs without one
+            const backendCat = node.influence_cat;
+            const isTitan = backendCat ? backendCat === 'Titan' : index < titanCount;
+            const isMacro = backendCat ? backendCat === 'Macro' : index < titanCount + macroCount;
+
             // Using your logic but updating colors for White BG
-            if (index < titanCount) {
+            if (isTitan) {
                 cat = 'Titan';
                 color = '#D97706'; // Amber-600 (Titan)
                 size = 18;
                 newId = `Titan-${node.id}`;
-            } else if (index < titanCount + macroCount) {
+            } else if (isMacro) {
                 cat = 'Macro';
                 color = '#DC2626'; // Red-600 (Macro)
                 size = 10;
                 newId = `Macro-${node.id}`;
             } else {
-                cat = 'Micro';
+                cat = backendCat || 'Micro';
                 color = '#059669'; // Emerald-600 (Micro)
                 size = 6;
                 newId = `User-${node.id}`;
             }
 
+            if (node.name) newId = node.name;
+
             // Store mapping
             idMap[node.id] = newId;
 
@@ -15,4 +15,34 @@ export const runSimulation = async (token, config) => {
         headers: { Authorization: `Bearer ${token}` }
     });
     return response.data;
-};
\ No newline at end of file
+};
+
+const RUN_PAGE_SIZE = 500; // Backend MAX_PAGE_SIZE
+
+// Pages through a stored run and decodes its index-encoded steps back into
+// SimulationStep objects (display names), the shape the replay expects.
+export const fetchRunSteps = async (token, runId) => {
+    const steps = [];
+    let total = Infinity;
+    while (steps.length < total) {
+        const response = await axios.get(`${API_URL}/runs/${runId}/steps`, {
+            headers: { Authorization: `Bearer ${token}` },
+            params: { start: steps.length, limit: RUN_PAGE_SIZE }
+        });
+        const page = response.data;
+        total = page.total_steps;
+        if (page.steps.length === 0) break;
+        const name = (idx) => page.names[idx];
+        for (const step of page.steps) {
+            steps.push({
+                timestep: step.timestep,
+                active_spreaders: step.active_spreaders,
+                total_reach: step.total_reach,
+                newly_activated: step.newly_activated.map(name),
+                activation_paths: step.sources.map((src, i) => [name(src), name(step.newly_activated[i])]),
+                live_top_5: step.live_top_5.map(e => ({ id: name(e.id), count: e.count }))
+            });
+        }
+    }
+    return steps;
+};